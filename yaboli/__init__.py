@@ -17,7 +17,7 @@ from .session import *
 from .util import *
 
 __all__ = ["STYLE", "FORMAT", "DATE_FORMAT", "FORMATTER", "enable_logging",
-        "run", "run_modulebot"]
+        "install_uvloop", "run", "run_modulebot"]
 
 __all__ += bot.__all__
 __all__ += client.__all__
@@ -50,6 +50,24 @@ def enable_logging(name: str = "yaboli", level: int = logging.INFO) -> None:
     logger.setLevel(level)
     logger.addHandler(handler)
 
+def install_uvloop() -> bool:
+    """
+    Make asyncio use uvloop's faster event loop, if uvloop is installed. This
+    must be called before run() or run_modulebot().
+
+    Returns whether uvloop could be installed. uvloop isn't available on all
+    platforms (e. g. Windows), in which case the default event loop is used.
+    """
+
+    try:
+        import uvloop # type: ignore
+    except ImportError:
+        logging.getLogger(__name__).debug("uvloop not found, not installing")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
 def run(
         bot_constructor: BotConstructor,
         config_file: str = "bot.conf",
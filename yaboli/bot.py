@@ -64,14 +64,14 @@ class Bot(Client):
 
         nick = self.config[self.GENERAL_SECTION].get("nick")
         if nick is None:
-            logger.warn(("'nick' not set in config file. Defaulting to empty"
-                    " nick"))
+            logger.warning(("'nick' not set in config file. Defaulting to"
+                    " empty nick"))
             nick = ""
 
         cookie_file = self.config[self.GENERAL_SECTION].get("cookie_file")
         if cookie_file is None:
-            logger.warn(("'cookie_file' not set in config file. Using no cookie"
-                    " file."))
+            logger.warning(("'cookie_file' not set in config file. Using no"
+                    " cookie file."))
 
         super().__init__(nick, cookie_file=cookie_file)
 
@@ -206,7 +206,8 @@ class Bot(Client):
         Format a list of strings into a string, replacing certain placeholders
         with the actual values.
 
-        This function uses the str.format() function to replace the following:
+        This function uses the str.format_map() function to replace the
+        following:
 
         - {nick} - the bot's current nick
         - {mention} - the bot's current nick, run through mention()
@@ -219,7 +220,7 @@ class Bot(Client):
                 "mention": room.session.mention,
                 "atmention": room.session.atmention,
         }
-        return text.format(**params)
+        return text.format_map(params)
 
     # Botrulez
 
@@ -266,8 +267,8 @@ class Bot(Client):
 
         if help_:
             if self.HELP_GENERAL is None and self.HELP_SPECIFIC is None:
-                logger.warn(("HELP_GENERAL and HELP_SPECIFIC are None, but the"
-                    " help command is enabled"))
+                logger.warning(("HELP_GENERAL and HELP_SPECIFIC are None, but"
+                    " the help command is enabled"))
             self.register_general("help", self.cmd_help_general, args=False)
             self.register_specific("help", self.cmd_help_specific, args=False)
 
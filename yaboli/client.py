@@ -104,7 +104,7 @@ class Client:
 
             return room
         else:
-            logger.warn(f"Could not join &{room.name}")
+            logger.warning(f"Could not join &{room.name}")
             return None
 
     async def part(self, room: Room) -> None:
@@ -1,11 +1,19 @@
 import asyncio
 import json
 import logging
+import random
 import socket
-from typing import Any, Awaitable, Callable, Dict, Optional
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
 
 import websockets
 
+try:
+    import orjson
+except ImportError:
+    orjson = None # type: ignore
+
 from .cookiejar import CookieJar
 from .events import Events
 from .exceptions import *
@@ -14,6 +22,25 @@ logger = logging.getLogger(__name__)
 
 __all__ = ["Connection"]
 
+# The functions used for encoding and decoding packets. If orjson is installed,
+# it is used instead of the (much slower) json module. These are module-level
+# variables so they can easily be swapped out, e. g. for testing.
+
+JsonDumps = Callable[[Any], str]
+JsonLoads = Callable[[Union[str, bytes]], Any]
+
+def _orjson_dumps(obj: Any) -> str:
+    # Websocket text frames need a str, but orjson produces bytes
+    return orjson.dumps(obj).decode()
+
+json_dumps: JsonDumps = json.dumps if orjson is None else _orjson_dumps
+json_loads: JsonLoads = json.loads if orjson is None else orjson.loads
+
+# Ping replies always have the same shape, so they are formatted directly
+# instead of being encoded by json_dumps.
+_PING_REPLY_FORMAT = ('{{"id": "{}", "type": "ping-reply",'
+        ' "data": {{"time": {}}}}}')
+
 # This class could probably be cleaned up by introducing one or two well-placed
 # Locks – something for the next rewrite :P
 
@@ -89,8 +116,20 @@ class Connection:
     # ping messages every 20 to 30 seconds.
     PING_TIMEOUT = 40 # seconds
 
-    # The delay between reconnect attempts.
-    RECONNECT_DELAY = 40 # seconds
+    # The base delay between reconnect attempts. Up to version 1.2.0, this was
+    # a fixed delay of 40 seconds. Now, it is doubled after every failed
+    # attempt and capped at RECONNECT_DELAY_MAX. The result is then randomly
+    # varied by up to RECONNECT_JITTER (as a fraction of the delay) so that
+    # lots of bots don't all hit the server at the same time, even once their
+    # delays have reached the cap.
+    #
+    # A connection that is closed again before it has been up for
+    # RECONNECT_RESET_AFTER also counts as a failed attempt. Only connections
+    # that stay up longer than that reset the delay.
+    RECONNECT_DELAY = 5 # seconds
+    RECONNECT_DELAY_MAX = 120 # seconds
+    RECONNECT_JITTER = 0.5
+    RECONNECT_RESET_AFTER = 30 # seconds
 
     # States the Connection may be in
     _NOT_RUNNING = "not running"
@@ -119,6 +158,16 @@ class Connection:
 
         self._event_loop: Optional[asyncio.Task[None]] = None
 
+        # When the current ws connection was established, according to
+        # time.monotonic()
+        self._connected_at = 0.0
+
+        # Set by reconnect() while a reconnect it requested is pending. Further
+        # reconnect() calls wait for it instead of closing the ws connection
+        # again. It is resolved once the event loop has reconnected or the
+        # Connection has been disconnected, whichever happens first.
+        self._reconnect_waiter: Optional[asyncio.Future[None]] = None
+
         # These must always be (re)set together. If one of them is None, all
         # must be None.
         self._ws = None
@@ -193,8 +242,11 @@ class Connection:
             )
             logger.debug(f"Established ws connection to {self._url!r}")
 
+            self._disable_nagle(ws)
+
             self._ws = ws
             self._awaiting_replies = {}
+            self._connected_at = time.monotonic()
             logger.debug("Starting ping check")
             self._ping_check = asyncio.create_task(
                     self._disconnect_in(self.PING_TIMEOUT))
@@ -211,6 +263,24 @@ class Connection:
             logger.debug("Connection failed")
             return False
 
+    def _disable_nagle(self, ws: Any) -> None:
+        """
+        Packets are small and should be sent immediately instead of waiting for
+        more data to fill up a TCP segment.
+
+        asyncio already sets TCP_NODELAY on most platforms, so this only makes
+        sure it is actually set.
+        """
+
+        sock = ws.transport.get_extra_info("socket")
+        if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return
+
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            logger.debug("Could not set TCP_NODELAY")
+
     async def _disconnect_in(self, delay: int) -> None:
         await asyncio.sleep(delay)
         logger.debug(f"Disconnect timeout of {delay}s elapsed, disconnecting...")
@@ -245,9 +315,22 @@ class Connection:
         async with self._connected_condition:
             self._connected_condition.notify_all()
 
+        self._finish_reconnect_request()
+
         logger.debug("Reconnected" if success else "Reconnection failed")
         return success
 
+    def _finish_reconnect_request(self) -> None:
+        """
+        Wake up everybody waiting in reconnect() for a previously requested
+        reconnect to happen.
+        """
+
+        waiter = self._reconnect_waiter
+        self._reconnect_waiter = None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
     async def connect(self) -> bool:
         """
         Attempt to create a connection to the Connection's url.
@@ -362,6 +445,10 @@ class Connection:
 
         self._state = self._NOT_RUNNING
 
+        # The event loop has stopped, so a requested reconnect won't happen
+        # anymore.
+        self._finish_reconnect_request()
+
         # Notify all other disconnect()s waiting
         logger.debug("Sending disconnected notification")
         async with self._disconnected_condition:
@@ -373,7 +460,15 @@ class Connection:
         """
         Forces the Connection to reconnect.
 
-        This function may return before the reconnect process is finished.
+        Only one reconnect is requested at a time. The call that requests it
+        returns once the ws connection has been closed, which may be before the
+        event loop has reconnected. Calls made while that request is still
+        pending don't cause another reconnect. Instead, they wait until the
+        event loop's next reconnect attempt has finished (whether it succeeded
+        or not) or until disconnect() stops the Connection.
+
+        Calls made while the Connection is already (re-)connecting wait until
+        it has finished (re-)connecting.
 
         Exceptions:
 
@@ -393,6 +488,19 @@ class Connection:
             raise IncorrectStateException(("reconnect() may not be called while"
                 " the connection is not running."))
 
+        # Multiple reconnect requests in quick succession (e. g. a few
+        # "authentication changed" disconnect-events in a row) should only
+        # result in a single reconnect.
+        if self._reconnect_waiter is not None:
+            logger.debug("Reconnect already requested, waiting...")
+            # Shielded so that a cancelled caller doesn't cancel the waiter
+            # for everybody else
+            await asyncio.shield(self._reconnect_waiter)
+            logger.debug("Reconnect request finished, finished waiting")
+            return
+
+        self._reconnect_waiter = asyncio.get_running_loop().create_future()
+
         # Disconnecting via task because otherwise, the _connected_condition
         # might fire before we start waiting for it.
         #
@@ -408,6 +516,10 @@ class Connection:
         The main loop that runs during phase 3
         """
 
+        # Number of failed reconnect attempts since the last connection that
+        # stayed up for long enough
+        attempt = 0
+
         while True:
             # The "Exiting event loop" checks are a bit ugly. They're in place
             # so that the event loop exits on its own at predefined positions
@@ -426,7 +538,7 @@ class Connection:
                     logger.debug("Receiving ws packets")
                     async for packet in self._ws:
                         logger.debug(f"Received packet {packet}")
-                        packet_data = json.loads(packet)
+                        packet_data = json_loads(packet)
                         self._process_packet(packet_data)
                 except websockets.ConnectionClosed:
                     logger.debug("Stopped receiving ws packets")
@@ -437,16 +549,46 @@ class Connection:
                 logger.debug("Exiting event loop")
                 return
 
+            # Reconnects requested via reconnect() happen immediately, no
+            # matter how long the connection was up.
+            uptime = time.monotonic() - self._connected_at
+            if uptime >= self.RECONNECT_RESET_AFTER or \
+                    self._reconnect_waiter is not None:
+                attempt = 0
+
             logger.debug("Attempting to reconnect")
-            while not await self._reconnect():
+            while True:
+                if attempt > 0:
+                    delay = self._reconnect_delay(attempt - 1)
+                    logger.debug(f"Sleeping for {delay:.1f}s")
+                    await asyncio.sleep(delay)
+
+                    if self._state != self._RUNNING:
+                        logger.debug("Exiting event loop")
+                        return
+
+                attempt += 1
+                if await self._reconnect():
+                    break
+
                 logger.debug("Reconnect attempt not successful")
 
                 if self._state != self._RUNNING:
                     logger.debug("Exiting event loop")
                     return
 
-                logger.debug(f"Sleeping for {self.RECONNECT_DELAY}s and retrying")
-                await asyncio.sleep(self.RECONNECT_DELAY)
+    def _reconnect_delay(self, attempt: int) -> float:
+        """
+        Exponential backoff with jitter. The attempt parameter is the number of
+        failed attempts before the last one.
+        """
+
+        # Limiting the exponent since floats overflow eventually, and the delay
+        # is capped long before that anyways
+        delay = self.RECONNECT_DELAY * 2 ** min(attempt, 32)
+        delay = min(delay, self.RECONNECT_DELAY_MAX)
+        jitter = self.RECONNECT_JITTER
+        return delay * random.uniform(1 - jitter, 1 + jitter)
 
     def _process_packet(self, packet: Any) -> None:
         # This function assumes that the packet is formed correctly according
@@ -461,7 +603,7 @@ class Connection:
                 future.set_result(packet)
 
         # Then, send the corresponding event
-        packet_type = packet["type"]
+        packet_type = sys.intern(packet["type"])
         self._events.fire(packet_type, packet)
 
         # Finally, reset the ping check
@@ -472,15 +614,6 @@ class Connection:
             self._ping_check = asyncio.create_task(
                     self._disconnect_in(self.PING_TIMEOUT))
 
-    async def _do_if_possible(self, coroutine: Awaitable[None]) -> None:
-        """
-        Try to run a coroutine, ignoring any IncorrectStateExceptions.
-        """
-        try:
-            await coroutine
-        except IncorrectStateException:
-            pass
-
     async def _send_if_possible(self, packet_type: str, data: Any,) -> None:
         """
         This function tries to send a packet without awaiting the reply.
@@ -500,11 +633,22 @@ class Connection:
         callback.
         """
         logger.debug("Pong!")
-        await self._do_if_possible(self.send(
-            "ping-reply",
-            {"time": packet["data"]["time"]},
-            await_reply=False
-        ))
+
+        # Not going through send() since there is no reply to wait for, and
+        # answering a ping after a reconnect makes no sense anyways.
+        if self._state != self._RUNNING or self._ws is None:
+            logger.debug("Not replying to ping (not running)")
+            return
+
+        packet_id = str(self._packet_id)
+        self._packet_id += 1
+
+        text = _PING_REPLY_FORMAT.format(packet_id, int(packet["data"]["time"]))
+        logger.debug(f"Sending packet {text}")
+        try:
+            await self._ws.send(text)
+        except websockets.ConnectionClosed:
+            logger.debug("Could not reply to ping (connection closed)")
 
     async def send(self,
             packet_type: str,
@@ -554,7 +698,7 @@ class Connection:
             response: asyncio.Future[Any] = asyncio.Future()
             self._awaiting_replies[packet_id] = response
 
-        text = json.dumps({"id": packet_id, "type": packet_type, "data": data})
+        text = json_dumps({"id": packet_id, "type": packet_type, "data": data})
         logger.debug(f"Sending packet {text}")
         try:
             await self._ws.send(text)
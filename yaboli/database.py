@@ -18,7 +18,7 @@ def operation(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
                 try:
                     return await asyncify(func, self, db, *args, **kwargs)
                 except sqlite3.OperationalError as e:
-                    logger.warn(f"Operational error encountered: {e}")
+                    logger.warning(f"Operational error encountered: {e}")
                     await asyncio.sleep(5)
     return wrapper
 
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import sys
 from typing import Any, Awaitable, Callable, Dict, List
 
 logger = logging.getLogger(__name__)
@@ -14,12 +15,29 @@ class Events:
             event: str,
             callback: Callable[..., Awaitable[None]]
             ) -> None:
+        # Events are usually fired with strings decoded from packets, which can
+        # be looked up faster if both they and the keys are interned.
+        event = sys.intern(event)
+
         callback_list = self._callbacks.get(event, [])
         callback_list.append(callback)
         self._callbacks[event] = callback_list
         logger.debug(f"Registered callback for event {event!r}")
 
+    def has_callbacks(self, event: str) -> bool:
+        """
+        Whether any callbacks are registered for the event. This can be used to
+        avoid preparing the arguments of events that nobody is listening for.
+        """
+
+        return bool(self._callbacks.get(event))
+
     def fire(self, event: str, *args: Any, **kwargs: Any) -> None:
+        callbacks = self._callbacks.get(event)
+        if not callbacks:
+            # Nobody's listening (e. g. for most of the reply packets)
+            return
+
         logger.debug(f"Calling callbacks for event {event!r}")
-        for callback in self._callbacks.get(event, []):
+        for callback in callbacks:
             asyncio.create_task(callback(*args, **kwargs))
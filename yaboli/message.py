@@ -1,14 +1,23 @@
 import datetime
-from typing import TYPE_CHECKING, Any, List, Optional
+import operator
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from .session import LiveSession, Session
+from .session import _SESSION_KEYS, LiveSession, Session
 
 if TYPE_CHECKING:
     from .room import Room
 
 __all__ = ["Message", "LiveMessage"]
 
+# Required fields of a http://api.euphoria.io/#message
+_MESSAGE_KEYS = operator.itemgetter("id", "time", "sender", "content")
+
 class Message:
+    # Snapshots and logs contain lots of messages, so they don't get a __dict__.
+    __slots__ = ("_room_name", "_message_id", "_parent_id", "_previous_edit_id",
+            "_timestamp", "_sender", "_content", "_encryption_key_id",
+            "_edited_timestamp", "_deleted_timestamp", "_truncated")
+
     def __init__(self,
             room_name: str,
             message_id: str,
@@ -36,12 +45,10 @@ class Message:
 
     @classmethod
     def from_data(cls, room_name: str, data: Any) -> "Message":
-        message_id = data["id"]
+        message_id, timestamp, sender_data, content = _MESSAGE_KEYS(data)
         parent_id = data.get("parent")
         previous_edit_id = data.get("previous_edit_id")
-        timestamp = data["time"]
-        sender = Session.from_data(room_name, data["sender"])
-        content = data["content"]
+        sender = Session.from_data(room_name, sender_data)
         encryption_key_id = data.get("encryption_key_id")
         edited_timestamp = data.get("edited")
         deleted_timestamp = data.get("deleted")
@@ -116,6 +123,8 @@ class Message:
         return self._truncated
 
 class LiveMessage(Message):
+    __slots__ = ("_room", "_live_sender")
+
     def __init__(self,
             room: "Room",
             message_id: str,
@@ -142,6 +151,50 @@ class LiveMessage(Message):
             ) -> "LiveMessage":
         return cls.from_message(room, Message.from_data(room.name, data))
 
+    @classmethod
+    def from_data_batch(cls,
+            room: "Room",
+            data: Any
+            ) -> List["LiveMessage"]:
+        """
+        The data parameter must be a list of messages, for example the "log"
+        part of a snapshot-event or log-reply.
+
+        Equivalent to calling from_data() for every message in the list, but
+        the LiveMessages are constructed directly instead of going through an
+        intermediate Message. This matters for big snapshots and logs.
+
+        Since sessions are immutable and most messages in a log come from only a
+        few senders, messages with identical sender data share a single
+        LiveSession object.
+        """
+
+        session_from_data = LiveSession.from_data
+        message_keys = _MESSAGE_KEYS
+        session_keys = _SESSION_KEYS
+
+        senders: Dict[Tuple[Any, ...], LiveSession] = {}
+
+        messages = []
+        for msg_data in data:
+            message_id, timestamp, sender_data, content = message_keys(msg_data)
+
+            sender_get = sender_data.get
+            sender_key = (session_keys(sender_data), sender_get("is_staff"),
+                    sender_get("is_manager"), sender_get("client_address"))
+            sender = senders.get(sender_key)
+            if sender is None:
+                sender = session_from_data(room, sender_data)
+                senders[sender_key] = sender
+
+            get = msg_data.get
+            messages.append(cls(room, message_id, get("parent"),
+                    get("previous_edit_id"), timestamp, sender, content,
+                    get("encryption_key_id"), get("edited"), get("deleted"),
+                    get("truncated", False)))
+
+        return messages
+
     @classmethod
     def from_message(cls, room: "Room", message: Message) -> "LiveMessage":
         live_sender = LiveSession.from_session(room, message.sender)
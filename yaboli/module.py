@@ -1,6 +1,8 @@
+import asyncio
 import configparser
+import functools
 import logging
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from .bot import Bot
 from .command import *
@@ -39,6 +41,13 @@ class ModuleBot(Bot):
 
     MODULES_SECTION = "modules"
 
+    # Events that are forwarded to the modules without waiting for the modules
+    # to finish handling them
+    DISPATCH_ASYNC: Set[str] = {"on_send", "on_edit", "on_nick"}
+    # How long stop() waits for the modules to finish handling those events
+    # before cancelling them
+    MODULE_STOP_TIMEOUT = 10 # seconds
+
     def __init__(self,
             config: configparser.ConfigParser,
             config_file: str,
@@ -48,12 +57,13 @@ class ModuleBot(Bot):
 
         self.module_constructors = module_constructors
         self.modules: Dict[str, Module] = {}
+        self._module_tasks: Set["asyncio.Task[None]"] = set()
 
         # Load initial modules
         for module_name in self.config[self.MODULES_SECTION]:
             module_constructor = self.module_constructors.get(module_name)
             if module_constructor is None:
-                logger.warn(f"Module {module_name} not found")
+                logger.warning(f"Module {module_name} not found")
                 continue
             # standalone is set to False
             module = module_constructor(self.config, self.config_file, False)
@@ -61,7 +71,8 @@ class ModuleBot(Bot):
 
     def load_module(self, name: str, module: Module) -> None:
         if name in self.modules:
-            logger.warn(f"Module {name!r} is already registered, overwriting...")
+            logger.warning(f"Module {name!r} is already registered,"
+                    " overwriting...")
         self.modules[name] = module
 
     def unload_module(self, name: str) -> None:
@@ -71,29 +82,24 @@ class ModuleBot(Bot):
     # Better help messages
 
     def compile_module_overview(self) -> List[str]:
-        lines = []
+        lines: List[str] = []
 
         if self.HELP_PRE is not None:
             lines.extend(self.HELP_PRE)
 
-        any_modules = False
-
         modules_without_desc: List[str] = []
-        for module_name in sorted(self.modules):
-            any_modules = True
-
-            module = self.modules[module_name]
+        for module_name, module in sorted(self.modules.items()):
+            description = module.DESCRIPTION
 
-            if module.DESCRIPTION is None:
+            if description is None:
                 modules_without_desc.append(module_name)
             else:
-                line = f"\t{module_name} — {module.DESCRIPTION}"
-                lines.append(line)
+                lines.append(f"\t{module_name} — {description}")
 
         if modules_without_desc:
             lines.append("\t" + ", ".join(modules_without_desc))
 
-        if not any_modules:
+        if not self.modules:
             lines.append("No modules loaded.")
 
         if self.HELP_POST is not None:
@@ -117,49 +123,135 @@ class ModuleBot(Bot):
             args: SpecificArgumentData
             ) -> None:
         if args.has_args():
-            if len(args.basic()) > self.MODULE_HELP_LIMIT:
+            module_names = args.basic()
+            if len(module_names) > self.MODULE_HELP_LIMIT:
                 limit = self.MODULE_HELP_LIMIT
                 text = f"A maximum of {limit} module{plural(limit)} is allowed."
                 await message.reply(text)
             else:
-                for module_name in args.basic():
-                    help_lines = self.compile_module_help(module_name)
-                    await message.reply(self.format_help(room, help_lines))
+                # Replying with a single message instead of one per module
+                help_lines: List[str] = []
+                for module_name in module_names:
+                    if help_lines:
+                        help_lines.append("")
+                    help_lines.extend(self.compile_module_help(module_name))
+                await message.reply(self.format_help(room, help_lines))
         else:
             help_lines = self.compile_module_overview()
             await message.reply(self.format_help(room, help_lines))
 
+    async def stop(self) -> None:
+        """
+        This Client function is overwritten in order to wait for the modules to
+        finish handling all events in DISPATCH_ASYNC before stopping.
+
+        Module tasks that are still running after MODULE_STOP_TIMEOUT seconds
+        are cancelled.
+        """
+
+        current = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.MODULE_STOP_TIMEOUT
+
+        # Looping since modules may receive new events while we're waiting
+        while True:
+            tasks = [task for task in self._module_tasks
+                    if task is not current and not task.done()]
+            if not tasks:
+                break
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                logger.warning(f"Cancelling {len(tasks)} module task(s) that"
+                        " didn't finish in time")
+                for task in tasks:
+                    task.cancel()
+                break
+
+            logger.debug(f"Waiting for {len(tasks)} module task(s) to finish")
+            await asyncio.wait(tasks, timeout=timeout)
+
+        await super().stop()
+
     # Sending along all kinds of events
 
+    def _log_module_exception(self,
+            name: str,
+            event: str,
+            exception: BaseException
+            ) -> None:
+        logger.error(f"Module {name!r} raised an exception in {event}",
+                exc_info=exception)
+
+    def _log_task_exc(self,
+            name: str,
+            event: str,
+            task: "asyncio.Task[None]"
+            ) -> None:
+        self._module_tasks.discard(task)
+
+        if task.cancelled():
+            return
+
+        exception = task.exception()
+        if exception is not None:
+            self._log_module_exception(name, event, exception)
+
+    async def _fanout(self, event: str, *args: Any) -> None:
+        """
+        Call the event function with the name event on all modules at the same
+        time and wait until all of them have finished.
+
+        If the event is in DISPATCH_ASYNC, this function doesn't wait for the
+        modules and returns immediately instead.
+
+        Exceptions raised by a module are logged instead of being propagated,
+        so that one misbehaving module can't prevent the others from receiving
+        the event.
+        """
+
+        # Modules may be loaded or unloaded while the event is being handled
+        modules = tuple(self.modules.items())
+
+        if event in self.DISPATCH_ASYNC:
+            for name, module in modules:
+                task = asyncio.create_task(getattr(module, event)(*args))
+                task.add_done_callback(
+                        functools.partial(self._log_task_exc, name, event))
+                self._module_tasks.add(task)
+            return
+
+        coros = [getattr(module, event)(*args) for _, module in modules]
+        results = await asyncio.gather(*coros, return_exceptions=True)
+
+        for (name, _), result in zip(modules, results):
+            if isinstance(result, Exception):
+                self._log_module_exception(name, event, result)
+
     async def on_connected(self, room: Room) -> None:
         await super().on_connected(room)
 
-        for module in self.modules.values():
-            await module.on_connected(room)
+        await self._fanout("on_connected", room)
 
     async def on_snapshot(self, room: Room, messages: List[LiveMessage]) -> None:
         await super().on_snapshot(room, messages)
 
-        for module in self.modules.values():
-            await module.on_snapshot(room, messages)
+        await self._fanout("on_snapshot", room, messages)
 
     async def on_send(self, room: Room, message: LiveMessage) -> None:
         await super().on_send(room, message)
 
-        for module in self.modules.values():
-            await module.on_send(room, message)
+        await self._fanout("on_send", room, message)
 
     async def on_join(self, room: Room, user: LiveSession) -> None:
         await super().on_join(room, user)
 
-        for module in self.modules.values():
-            await module.on_join(room, user)
+        await self._fanout("on_join", room, user)
 
     async def on_part(self, room: Room, user: LiveSession) -> None:
         await super().on_part(room, user)
 
-        for module in self.modules.values():
-            await module.on_part(room, user)
+        await self._fanout("on_part", room, user)
 
     async def on_nick(self,
             room: Room,
@@ -169,26 +261,22 @@ class ModuleBot(Bot):
             ) -> None:
         await super().on_nick(room, user, from_nick, to_nick)
 
-        for module in self.modules.values():
-            await module.on_nick(room, user, from_nick, to_nick)
+        await self._fanout("on_nick", room, user, from_nick, to_nick)
 
     async def on_edit(self, room: Room, message: LiveMessage) -> None:
         await super().on_edit(room, message)
 
-        for module in self.modules.values():
-            await module.on_edit(room, message)
+        await self._fanout("on_edit", room, message)
 
     async def on_login(self, room: Room, account_id: str) -> None:
         await super().on_login(room, account_id)
 
-        for module in self.modules.values():
-            await module.on_login(room, account_id)
+        await self._fanout("on_login", room, account_id)
 
     async def on_logout(self, room: Room) -> None:
         await super().on_logout(room)
 
-        for module in self.modules.values():
-            await module.on_logout(room)
+        await self._fanout("on_logout", room)
 
     async def on_pm(self,
             room: Room,
@@ -199,14 +287,12 @@ class ModuleBot(Bot):
             ) -> None:
         await super().on_pm(room, from_id, from_nick, from_room, pm_id)
 
-        for module in self.modules.values():
-            await module.on_pm(room, from_id, from_nick, from_room, pm_id)
+        await self._fanout("on_pm", room, from_id, from_nick, from_room, pm_id)
 
     async def on_disconnect(self, room: Room, reason: str) -> None:
         await super().on_disconnect(room, reason)
 
-        for module in self.modules.values():
-            await module.on_disconnect(room, reason)
+        await self._fanout("on_disconnect", room, reason)
 
 ModuleBotConstructor = Callable[
         [configparser.ConfigParser, str, Dict[str, ModuleConstructor]],
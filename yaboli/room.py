@@ -1,6 +1,8 @@
 import asyncio
 import logging
-from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+import operator
+from typing import (Any, Awaitable, Callable, Dict, List, Optional, Tuple,
+                    TypeVar)
 
 from .connection import Connection
 from .events import Events
@@ -15,6 +17,14 @@ __all__ = ["Room"]
 
 T = TypeVar("T")
 
+# Extracting the required fields of various packets in one go. Optional fields
+# are still accessed via get().
+_HELLO_KEYS = operator.itemgetter("session", "room_is_private", "version")
+_SNAPSHOT_KEYS = operator.itemgetter("version", "listing", "log")
+_NETWORK_KEYS = operator.itemgetter("server_id", "server_era")
+_NICK_KEYS = operator.itemgetter("session_id", "from", "to")
+_PM_KEYS = operator.itemgetter("from", "from_nick", "from_room", "pm_id")
+
 class Room:
     """
     Events and parameters:
@@ -62,6 +72,37 @@ class Room:
 
     URL_FORMAT = "wss://euphoria.io/room/{}/ws"
 
+    # A bot may be connected to many rooms at once, so Rooms shouldn't carry a
+    # __dict__ around. "__weakref__" keeps them weak-referenceable.
+    __slots__ = (
+            "_name", "_password", "_target_nick", "_url_format",
+            "_session", "_account", "_private", "_version", "_users",
+            "_pm_with_nick", "_pm_with_user_id", "_server_version",
+            "_url", "_connection", "_events",
+            "_connected", "_connected_successfully", "_hello_received",
+            "_snapshot_received",
+            "__weakref__",
+    )
+
+    # Connection events and the names of the functions handling them
+    _HANDLERS: Dict[str, str] = {
+            "reconnecting": "_on_reconnecting",
+            "hello-event": "_on_hello_event",
+            "snapshot-event": "_on_snapshot_event",
+            "bounce-event": "_on_bounce_event",
+
+            "disconnect-event": "_on_disconnect_event",
+            "join-event": "_on_join_event",
+            "login-event": "_on_login_event",
+            "logout-event": "_on_logout_event",
+            "network-event": "_on_network_event",
+            "nick-event": "_on_nick_event",
+            "edit-message-event": "_on_edit_message_event",
+            "part-event": "_on_part_event",
+            "pm-initiate-event": "_on_pm_initiate_event",
+            "send-event": "_on_send_event",
+    }
+
     def __init__(self,
             name: str,
             password: Optional[str] = None,
@@ -93,21 +134,8 @@ class Room:
         self._hello_received = False
         self._snapshot_received = False
 
-        self._connection.register_event("reconnecting", self._on_reconnecting)
-        self._connection.register_event("hello-event", self._on_hello_event)
-        self._connection.register_event("snapshot-event", self._on_snapshot_event)
-        self._connection.register_event("bounce-event", self._on_bounce_event)
-
-        self._connection.register_event("disconnect-event", self._on_disconnect_event)
-        self._connection.register_event("join-event", self._on_join_event)
-        self._connection.register_event("login-event", self._on_login_event)
-        self._connection.register_event("logout-event", self._on_logout_event)
-        self._connection.register_event("network-event", self._on_network_event)
-        self._connection.register_event("nick-event", self._on_nick_event)
-        self._connection.register_event("edit-message-event", self._on_edit_message_event)
-        self._connection.register_event("part-event", self._on_part_event)
-        self._connection.register_event("pm-initiate-event", self._on_pm_initiate_event)
-        self._connection.register_event("send-event", self._on_send_event)
+        for event, handler_name in self._HANDLERS.items():
+            self._connection.register_event(event, getattr(self, handler_name))
 
     def register_event(self,
             event: str,
@@ -156,10 +184,11 @@ class Room:
 
     async def _on_hello_event(self, packet: Any) -> None:
         data = packet["data"]
+        session_data, private, version = _HELLO_KEYS(data)
 
-        self._session = LiveSession.from_data(self, data["session"])
-        self._private = data["room_is_private"]
-        self._version = data["version"]
+        self._session = LiveSession.from_data(self, session_data)
+        self._private = private
+        self._version = version
 
         if "account" in data:
             self._account = Account.from_data(data)
@@ -169,9 +198,10 @@ class Room:
 
     async def _on_snapshot_event(self, packet: Any) -> None:
         data = packet["data"]
+        server_version, listing_data, log_data = _SNAPSHOT_KEYS(data)
 
-        self._server_version = data["version"]
-        self._users = LiveSessionListing.from_data(self, data["listing"])
+        self._server_version = server_version
+        self._users = LiveSessionListing.from_data(self, listing_data)
         self._pm_with_nick = data.get("pm_with_nick")
         self._pm_with_user_id = data.get("pm_with_user_id")
 
@@ -181,9 +211,9 @@ class Room:
             self._session = self.session.with_nick(nick)
 
         # Send "snapshot" event
-        messages = [LiveMessage.from_data(self, msg_data)
-                for msg_data in data["log"]]
-        self._events.fire("snapshot", messages)
+        if self._events.has_callbacks("snapshot"):
+            messages = LiveMessage.from_data_batch(self, log_data)
+            self._events.fire("snapshot", messages)
 
         self._snapshot_received = True
         await self._try_set_connected()
@@ -258,7 +288,7 @@ class Room:
         session = LiveSession.from_data(self, data)
         self._users = self.users.with_join(session)
 
-        logger.info(f"&{self.name}: {session.atmention} joined")
+        logger.info("&%s: %s joined", self.name, session.atmention)
         self._events.fire("join", session)
 
     async def _on_login_event(self, packet: Any) -> None:
@@ -272,7 +302,8 @@ class Room:
         account_id = data["account_id"]
 
         self._events.fire("login", account_id)
-        logger.info(f"&{self.name}: Got logged in to {account_id}, reconnecting")
+        logger.info("&%s: Got logged in to %s, reconnecting", self.name,
+                account_id)
 
         await self._connection.reconnect()
 
@@ -283,7 +314,7 @@ class Room:
         """
 
         self._events.fire("logout")
-        logger.info(f"&{self.name}: Got logged out, reconnecting")
+        logger.info("&%s: Got logged out, reconnecting", self.name)
 
         await self._connection.reconnect()
 
@@ -291,35 +322,39 @@ class Room:
         data = packet["data"]
 
         if data["type"] == "partition":
-            server_id = data["server_id"]
-            server_era = data["server_era"]
+            server_id, server_era = _NETWORK_KEYS(data)
 
+            # A partition can remove lots of users at once, so the listing is
+            # only copied once and the attributes used in the loop are looked
+            # up only once.
             users = self.users
+            parted = users.by_server(server_id, server_era)
+            self._users = users.with_parts(parted)
 
-            for user in self.users:
-                if user.server_id == server_id and user.server_era == server_era:
-                    users = users.with_part(user)
-                    logger.info(f"&{self.name}: {user.atmention} left")
-                    self._events.fire("part", user)
-
-            self._users = users
+            name = self.name
+            fire = self._events.fire
+            for user in parted:
+                logger.info("&%s: %s left", name, user.atmention)
+                fire("part", user)
 
     async def _on_nick_event(self, packet: Any) -> None:
-        data = packet["data"]
-        session_id = data["session_id"]
-        nick_from = data["from"]
-        nick_to = data["to"]
+        session_id, nick_from, nick_to = _NICK_KEYS(packet["data"])
 
-        session = self.users.get(session_id)
+        users = self.users
+        session = users.get(session_id)
         if session is not None:
-            self._users = self.users.with_nick(session, nick_to)
+            self._users = users.with_nick(session, nick_to)
         else:
             await self.who() # recalibrating self._users
 
-        logger.info(f"&{self.name}: {atmention(nick_from)} is now called {atmention(nick_to)}")
+        logger.info("&%s: %s is now called %s", self.name, atmention(nick_from),
+                atmention(nick_to))
         self._events.fire("nick", session, nick_from, nick_to)
 
     async def _on_edit_message_event(self, packet: Any) -> None:
+        if not self._events.has_callbacks("edit"):
+            return
+
         data = packet["data"]
 
         message = LiveMessage.from_data(self, data)
@@ -332,19 +367,18 @@ class Room:
         session = LiveSession.from_data(self, data)
         self._users = self.users.with_part(session)
 
-        logger.info(f"&{self.name}: {session.atmention} left")
+        logger.info("&%s: %s left", self.name, session.atmention)
         self._events.fire("part", session)
 
     async def _on_pm_initiate_event(self, packet: Any) -> None:
-        data = packet["data"]
-        from_id = data["from"]
-        from_nick = data["from_nick"]
-        from_room = data["from_room"]
-        pm_id = data["pm_id"]
+        from_id, from_nick, from_room, pm_id = _PM_KEYS(packet["data"])
 
         self._events.fire("pm", from_id, from_nick, from_room, pm_id)
 
     async def _on_send_event(self, packet: Any) -> None:
+        if not self._events.has_callbacks("send"):
+            return
+
         data = packet["data"]
 
         message = LiveMessage.from_data(self, data)
@@ -417,7 +451,9 @@ class Room:
         return packet["data"]
 
     async def _ensure_connected(self) -> None:
-        await self._connected.wait()
+        # Most of the time, the room is already connected
+        if not self._connected.is_set():
+            await self._connected.wait()
 
         if not self._connected_successfully:
             raise RoomNotConnectedException()
@@ -488,9 +524,7 @@ class Room:
         reply = await self._connection.send("log", data)
         data = self._extract_data(reply)
 
-        messages = [LiveMessage.from_data(self, msg_data)
-                for msg_data in data["log"]]
-        return messages
+        return LiveMessage.from_data_batch(self, data["log"])
 
     async def who(self) -> LiveSessionListing:
         await self._ensure_connected()
@@ -498,14 +532,17 @@ class Room:
         reply = await self._connection.send("who", {})
         data = self._extract_data(reply)
 
-        users = LiveSessionListing.from_data(self, data["listing"])
         # Assumes that self._session is set (we're connected)
-        session = users.get(self.session.session_id)
-        if session is not None:
-            self._session = session
-            self._users = users.with_part(self._session)
-        else:
-            self._users = users
+        session_id = self.session.session_id
+        for subdata in data["listing"]:
+            if subdata["session_id"] == session_id:
+                self._session = LiveSession.from_data(self, subdata)
+                break
+
+        # Leaving out the own session while building the listing instead of
+        # removing it from a copy afterwards
+        self._users = LiveSessionListing.from_data(self, data["listing"],
+                exclude_id=session_id)
 
         return self._users
 
@@ -532,9 +569,10 @@ class Room:
         account_id_or_reason = data.get("account_id") or data["reason"]
 
         if success:
-            logger.info(f"&{self.name}: Logged in as {account_id_or_reason}")
+            logger.info("&%s: Logged in as %s", self.name, account_id_or_reason)
         else:
-            logger.info(f"&{self.name}: Failed to log in with {email} because {account_id_or_reason}")
+            logger.info("&%s: Failed to log in with %s because %s", self.name,
+                    email, account_id_or_reason)
 
         await self._connection.reconnect()
 
@@ -543,7 +581,7 @@ class Room:
     async def logout(self) -> None:
         await self._connection.send("logout", {})
 
-        logger.info(f"&{self.name}: Logged out")
+        logger.info("&%s: Logged out", self.name)
 
         await self._connection.reconnect()
 
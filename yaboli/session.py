@@ -1,6 +1,7 @@
+import operator
 import re
-from typing import (TYPE_CHECKING, Any, Dict, Iterable, Iterator, List,
-                    Optional, Tuple)
+from typing import (TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, Iterator,
+                    List, Optional, Set, Tuple)
 
 from .util import mention, normalize
 
@@ -9,6 +10,11 @@ if TYPE_CHECKING:
 
 __all__ = ["Account", "Session", "LiveSession", "LiveSessionListing"]
 
+# Required fields of a http://api.euphoria.io/#sessionview, in the order the
+# Session constructor takes them
+_SESSION_KEYS = operator.itemgetter("id", "name", "server_id", "server_era",
+        "session_id")
+
 class Account:
     """
     This class represents a http://api.euphoria.io/#personalaccountview, with a
@@ -74,6 +80,12 @@ class Account:
 class Session:
     _ID_SPLIT_RE = re.compile(r"(agent|account|bot):(.*)")
 
+    # Sessions are created for every message and every user in a listing, so
+    # they don't get a __dict__.
+    __slots__ = ("_room_name", "_user_id", "_id_type", "_nick", "_server_id",
+            "_server_era", "_session_id", "_is_staff", "_is_manager",
+            "_client_address")
+
     def __init__(self,
             room_name: str,
             user_id: str,
@@ -110,11 +122,7 @@ class Session:
 
     @classmethod
     def from_data(cls, room_name: str, data: Any) -> "Session":
-        user_id = data["id"]
-        nick = data["name"]
-        server_id = data["server_id"]
-        server_era = data["server_era"]
-        session_id = data["session_id"]
+        user_id, nick, server_id, server_era, session_id = _SESSION_KEYS(data)
         is_staff = data.get("is_staff", False)
         is_manager = data.get("is_manager", False)
         client_address = data.get("client_address")
@@ -194,6 +202,8 @@ class Session:
         return self._id_type == "bot"
 
 class LiveSession(Session):
+    __slots__ = ("_room",)
+
     def __init__(self,
             room: "Room",
             user_id: str,
@@ -218,7 +228,13 @@ class LiveSession(Session):
             room: "Room",
             data: Any
             ) -> "LiveSession":
-        return cls.from_session(room, Session.from_data(room.name, data))
+        # Constructing the LiveSession directly instead of going through an
+        # intermediate Session
+        user_id, nick, server_id, server_era, session_id = _SESSION_KEYS(data)
+        get = data.get
+        return cls(room, user_id, nick, server_id, server_era, session_id,
+                get("is_staff", False), get("is_manager", False),
+                get("client_address"))
 
     @classmethod
     def from_session(cls, room: "Room", session: Session) -> "LiveSession":
@@ -247,17 +263,48 @@ class LiveSession(Session):
         return await self.room.pm(self.user_id)
 
 class LiveSessionListing:
+    __slots__ = ("_room", "_sessions", "_by_server")
+
     def __init__(self, room: "Room", sessions: Iterable[LiveSession]) -> None:
         self._room = room
         # just to make sure it doesn't get changed on us
         self._sessions: Dict[str, LiveSession] = {session.session_id: session
                 for session in sessions}
 
+        # The session ids of all sessions, grouped by their server id and era.
+        # Frozensets are used so that copies of the listing can share them.
+        #
+        # The index is built in bulk here since adding sessions one by one
+        # would copy a server's frozenset for every session on that server.
+        by_server: Dict[Tuple[str, str], Set[str]] = {}
+        for session in self._sessions.values():
+            key = (session.server_id, session.server_era)
+            by_server.setdefault(key, set()).add(session.session_id)
+
+        self._by_server: Dict[Tuple[str, str], FrozenSet[str]] = {
+                key: frozenset(ids) for key, ids in by_server.items()}
+
     def __iter__(self) -> Iterator[LiveSession]:
         return self._sessions.values().__iter__()
 
     def _copy(self) -> "LiveSessionListing":
-        return LiveSessionListing(self.room, self)
+        copy = LiveSessionListing(self.room, [])
+        copy._sessions = dict(self._sessions)
+        copy._by_server = dict(self._by_server)
+        return copy
+
+    def _index_add(self, session: LiveSession) -> None:
+        key = (session.server_id, session.server_era)
+        ids = self._by_server.get(key, frozenset())
+        self._by_server[key] = ids | {session.session_id}
+
+    def _index_remove(self, session: LiveSession) -> None:
+        key = (session.server_id, session.server_era)
+        ids = self._by_server.get(key, frozenset()) - {session.session_id}
+        if ids:
+            self._by_server[key] = ids
+        else:
+            self._by_server.pop(key, None)
 
     @classmethod
     def from_data(cls,
@@ -265,28 +312,67 @@ class LiveSessionListing:
             data: Any,
             exclude_id: Optional[str] = None
             ) -> "LiveSessionListing":
-        sessions = [LiveSession.from_data(room, subdata) for subdata in data]
+        # Building the listing in a single pass over the data, without any
+        # intermediate lists
+        sessions = (LiveSession.from_data(room, subdata) for subdata in data)
 
         if exclude_id:
-            sessions = [session for session in sessions
-                    if session.session_id != exclude_id]
+            sessions = (session for session in sessions
+                    if session.session_id != exclude_id)
 
         return cls(room, sessions)
 
     def get(self, session_id: str) -> Optional[LiveSession]:
         return self._sessions.get(session_id)
 
+    def by_server(self, server_id: str, server_era: str) -> List[LiveSession]:
+        """
+        Return all sessions connected to the server with the given id and era.
+        """
+
+        ids = self._by_server.get((server_id, server_era))
+        if not ids:
+            return []
+
+        # Going through the listing instead of the ids so that the sessions
+        # are returned in listing order and not in (randomized) set order
+        return [session for session in self._sessions.values()
+                if session.session_id in ids]
+
+    def _set(self, session: LiveSession) -> None:
+        old = self._sessions.get(session.session_id)
+        if old is not None:
+            self._index_remove(old)
+
+        self._sessions[session.session_id] = session
+        self._index_add(session)
+
+    def _remove(self, session: LiveSession) -> None:
+        old = self._sessions.pop(session.session_id, None)
+        if old is not None:
+            self._index_remove(old)
+
     def with_join(self, session: LiveSession) -> "LiveSessionListing":
         copy = self._copy()
-        copy._sessions[session.session_id] = session
+        copy._set(session)
         return copy
 
     def with_part(self, session: LiveSession) -> "LiveSessionListing":
         copy = self._copy()
+        copy._remove(session)
+        return copy
 
-        if session.session_id in copy._sessions:
-            del copy._sessions[session.session_id]
+    def with_parts(self,
+            sessions: Iterable[LiveSession]
+            ) -> "LiveSessionListing":
+        """
+        Like with_part(), but for multiple sessions at once. The listing is
+        only copied once, no matter how many sessions are removed.
+        """
 
+        copy = self._copy()
+        for session in sessions:
+            copy._remove(session)
         return copy
 
     def with_nick(self,
@@ -294,7 +380,7 @@ class LiveSessionListing:
             new_nick: str
             ) -> "LiveSessionListing":
         copy = self._copy()
-        copy._sessions[session.session_id] = session.with_nick(new_nick)
+        copy._set(session.with_nick(new_nick))
         return copy
 
     # Attributes
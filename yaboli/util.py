@@ -14,6 +14,9 @@ async def asyncify(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
 
 # Name/nick related functions
 
+# Nicks are mentioned over and over again (e. g. in log messages for every
+# join, part and nick change), so the results are cached.
+@functools.lru_cache(maxsize=1024)
 def mention(nick: str, ping: bool = False) -> str:
     mentioned = re.sub(r"""[,.!?;&<'"\s]""", "", nick)
     return "@" + mentioned if ping else mentioned